@@ -11,39 +11,55 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
-def generate_sample_data(n_samples=1000, output_path='data/sample_data.csv'):
+# Output formats by file suffix
+FILE_FORMATS = {'.parquet': 'parquet', '.csv': 'csv'}
+
+def generate_sample_data(n_samples=1000, output_path='data/sample_data.parquet', rng=None, file_format=None):
     """
     Generate synthetic data for training the road safety model
+    
+    A seeded generator is created when rng is not provided, so output is reproducible by default.
+    The file format ('parquet' or 'csv') is taken from the output_path suffix when file_format is not given.
     """
-    np.random.seed(42)
+    suffix = os.path.splitext(output_path)[1].lower()
+    if suffix not in FILE_FORMATS:
+        raise ValueError(f"Unsupported output file suffix '{suffix}', expected one of {list(FILE_FORMATS)}")
+    if file_format is None:
+        file_format = FILE_FORMATS[suffix]
+    elif file_format != FILE_FORMATS[suffix]:
+        raise ValueError(f"Output path '{output_path}' does not match file format '{file_format}'")
+    
+    if rng is None:
+        rng = np.random.default_rng(42)
     
     # Generate junction IDs
     junction_ids = [f"j{i}" for i in range(1, n_samples + 1)]
     
     # Generate features
-    traffic_volume = np.random.normal(500, 200, n_samples)
-    traffic_volume = np.clip(traffic_volume, 50, 2000).astype(int)
+    traffic_volume = rng.normal(500, 200, n_samples)
+    traffic_volume = np.clip(traffic_volume, 50, 2000, out=traffic_volume).astype(np.int32)
     
-    speed_variance = np.random.normal(10, 5, n_samples)
-    speed_variance = np.clip(speed_variance, 1, 30).astype(int)
+    speed_variance = rng.normal(10, 5, n_samples)
+    speed_variance = np.clip(speed_variance, 1, 30, out=speed_variance).astype(np.int32)
     
-    weather_condition = np.random.randint(0, 5, n_samples)  # 0: clear, 1: cloudy, 2: rain, 3: snow, 4: fog
+    weather_condition = rng.integers(0, 5, n_samples, dtype=np.int32)  # 0: clear, 1: cloudy, 2: rain, 3: snow, 4: fog
     
-    time_of_day = np.random.randint(0, 4, n_samples)  # 0: morning peak, 1: day, 2: evening peak, 3: night
+    time_of_day = rng.integers(0, 4, n_samples, dtype=np.int32)  # 0: morning peak, 1: day, 2: evening peak, 3: night
     
-    road_condition = np.random.randint(0, 4, n_samples)  # 0: dry, 1: wet, 2: icy, 3: snowy
+    road_condition = rng.integers(0, 4, n_samples, dtype=np.int32)  # 0: dry, 1: wet, 2: icy, 3: snowy
     
-    junction_complexity = np.random.randint(1, 11, n_samples)  # 1-10 scale
+    junction_complexity = rng.integers(1, 11, n_samples, dtype=np.int32)  # 1-10 scale
     
-    incident_count = np.random.poisson(2, n_samples)
-    incident_count = np.clip(incident_count, 0, 20).astype(int)
+    incident_count = rng.poisson(2, n_samples)
+    incident_count = np.clip(incident_count, 0, 20, out=incident_count).astype(np.int32)
     
     # Generate coordinates (centered around London)
-    latitude = np.random.normal(51.5074, 0.1, n_samples)
-    longitude = np.random.normal(-0.1278, 0.1, n_samples)
+    latitude = rng.normal(51.5074, 0.1, n_samples)
+    longitude = rng.normal(-0.1278, 0.1, n_samples)
     
     # Generate risk level based on features
     # Higher traffic, higher variance, worse weather, and higher complexity increase risk
+    # Same divisions and summation order as the per-feature formula, so scores on the thresholds round identically
     risk_score = (
         (traffic_volume / 1000) + 
         (speed_variance / 10) + 
@@ -53,30 +69,47 @@ def generate_sample_data(n_samples=1000, output_path='data/sample_data.csv'):
         (incident_count / 10)
     )
     
-    risk_level = np.zeros(n_samples, dtype=int)
-    risk_level[risk_score > 2] = 1  # Medium risk
-    risk_level[risk_score > 3.5] = 2  # High risk
-    
-    # Create DataFrame
-    df = pd.DataFrame({
-        'junction_id': junction_ids,
-        'traffic_volume': traffic_volume,
-        'speed_variance': speed_variance,
-        'weather_condition': weather_condition,
-        'time_of_day': time_of_day,
-        'road_condition': road_condition,
-        'junction_complexity': junction_complexity,
-        'incident_count': incident_count,
-        'latitude': latitude,
-        'longitude': longitude,
-        'risk_level': risk_level
-    })
+    # 0: low risk (<= 2), 1: medium risk (<= 3.5), 2: high risk
+    risk_level = np.searchsorted(
+        np.asarray([2.0, 3.5], dtype=risk_score.dtype), risk_score
+    ).astype(np.int8)
+    
+    # Create DataFrame from a single column-major integer block so each
+    # column is contiguous in memory
+    int_columns = [
+        'traffic_volume', 'speed_variance', 'weather_condition', 'time_of_day',
+        'road_condition', 'junction_complexity', 'incident_count'
+    ]
+    int_block = np.asfortranarray(np.column_stack([
+        traffic_volume,
+        speed_variance,
+        weather_condition,
+        time_of_day,
+        road_condition,
+        junction_complexity,
+        incident_count
+    ]))
+    df = pd.DataFrame(int_block, columns=int_columns, copy=False)
+    df.insert(0, 'junction_id', junction_ids)
+    df['latitude'] = latitude
+    df['longitude'] = longitude
+    df['risk_level'] = risk_level
     
     # Create output directory if it doesn't exist
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     
-    # Save to CSV
-    df.to_csv(output_path, index=False)
+    # Save to Parquet, or CSV if requested
+    if file_format == 'csv':
+        df.to_csv(output_path, index=False)
+    else:
+        df.to_parquet(
+            output_path,
+            engine='pyarrow',
+            compression='zstd',
+            index=False,
+            use_dictionary=True,
+            row_group_size=131072
+        )
     logging.info(f"Generated {n_samples} samples and saved to {output_path}")
     
     # Print distribution of risk levels
@@ -90,12 +123,14 @@ def generate_sample_data(n_samples=1000, output_path='data/sample_data.csv'):
 def main():
     parser = argparse.ArgumentParser(description='Generate sample data for road safety prediction')
     parser.add_argument('--samples', type=int, default=1000, help='Number of samples to generate')
-    parser.add_argument('--output', type=str, default='data/sample_data.csv', help='Output file path')
+    parser.add_argument('--output', type=str, default=None, help='Output file path (default: data/sample_data.<format>)')
+    parser.add_argument('--format', type=str, choices=['parquet', 'csv'], default=None, help='Output file format (default: from --output suffix, else parquet)')
     
     args = parser.parse_args()
     
     try:
-        generate_sample_data(args.samples, args.output)
+        output_path = args.output or f"data/sample_data.{args.format or 'parquet'}"
+        generate_sample_data(args.samples, output_path, file_format=args.format)
     except Exception as e:
         logging.error(f"Error generating sample data: {str(e)}")
         return 1
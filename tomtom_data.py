@@ -1,25 +1,122 @@
-import requests
+import httpx
 import pandas as pd
 import numpy as np
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+# Weather and road categories, in encoding order, and their mock probabilities
+_WEATHER_CONDITIONS = ["clear", "cloudy", "rain", "snow", "fog"]
+_WEATHER_CUM_PROBS = np.cumsum([0.4, 0.3, 0.2, 0.05, 0.05])
+_ROAD_CONDITIONS = ["dry", "wet", "icy", "snowy"]
+_ROAD_CUM_PROBS = np.cumsum([0.6, 0.3, 0.05, 0.05])
+
+# Traffic volume factor by hour of day: peak 7-9 and 16-18, night 22-5
+_TIME_FACTOR_BY_HOUR = np.array(
+    [0.3] * 6 + [1.0] + [1.5] * 3 + [1.0] * 6 + [1.5] * 3 + [1.0] * 3 + [0.3] * 2,
+    dtype=np.float64
+)
+
+# Time of day encoding by hour (morning peak=0, day=1, evening peak=2, night=3)
+_TIME_OF_DAY_BY_HOUR = np.array(
+    [3, 3, 3, 3, 3, 3, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 2, 1, 1, 1, 3, 3],
+    dtype=np.uint8
+)
+
+
+def _encode_conditions(values: List[str], categories: List[str]) -> np.ndarray:
+    """
+    Encode condition names as their index in categories
+    
+    Args:
+        values: Condition names to encode
+        categories: Known condition names, in encoding order
+        
+    Returns:
+        Array of uint8 codes, with unknown names encoded as 0
+    """
+    codes = pd.Categorical(values, categories=categories).codes
+    return np.where(codes < 0, 0, codes).astype(np.uint8)
+
+
+def _derive_flow_features(
+    free_flow_speed: np.ndarray,
+    current_speed: np.ndarray,
+    has_flow: np.ndarray,
+    current_hour: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Derive traffic volume and speed variance for a batch of junctions
+    
+    Args:
+        free_flow_speed: Free flow speed (km/h) per junction
+        current_speed: Current speed (km/h) per junction
+        has_flow: Whether flow data was available for each junction
+        current_hour: Hour of day used to scale traffic volume
+        
+    Returns:
+        Tuple of (traffic_volume, speed_variance) arrays, with defaults where flow data is missing
+    """
+    # Traffic volume (vehicles per hour) - estimated from speed ratio and road type
+    safe_free_flow = np.where(free_flow_speed > 0, free_flow_speed, 1.0)
+    speed_ratio = np.where(free_flow_speed > 0, current_speed / safe_free_flow, 1.0)
+    base_volume = np.where(free_flow_speed > 80, 1000, 500)
+    
+    # Adjust for time of day
+    time_factor = _TIME_FACTOR_BY_HOUR[current_hour]
+    traffic_volume = np.where(
+        has_flow, base_volume * time_factor * speed_ratio, 500
+    ).astype(np.int32)
+    
+    # Speed variance (km/h) - based on difference from free flow
+    speed_variance = np.where(
+        has_flow, np.clip(np.abs(free_flow_speed - current_speed) * 2, 5, 30), 5
+    ).astype(np.int16)
+    
+    return traffic_volume, speed_variance
+
 
 class TomTomDataFetcher:
     """
     A class to fetch and process traffic data from TomTom API
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_workers: int = 32):
         """
         Initialize the TomTom data fetcher with API key
         
         Args:
             api_key: TomTom API key
+            max_workers: Maximum number of concurrent API requests (default: 32)
         """
         self.api_key = api_key
         self.base_url = "https://api.tomtom.com"
+        self.max_workers = max_workers
+        
+        # Reuse pooled HTTP/2 connections across requests
+        self._client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=5.0
+        )
+        
+        # Mock weather results for the current hour, keyed by (latitude, longitude, hour)
+        self._weather_cache: Dict[Tuple[float, float, int], Dict[str, Any]] = {}
+        self._weather_cache_hour: Optional[int] = None
         
+    def close(self) -> None:
+        """
+        Close the underlying HTTP client and its pooled connections
+        """
+        self._client.close()
+    
+    def __enter__(self) -> "TomTomDataFetcher":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     def get_traffic_flow(self, latitude: float, longitude: float) -> Dict[str, Any]:
         """
         Get traffic flow data for a specific location
@@ -38,7 +135,7 @@ class TomTomDataFetcher:
                 "point": f"{latitude},{longitude}"
             }
             
-            response = requests.get(url, params=params)
+            response = self._client.get(url, params=params)
             response.raise_for_status()
             
             return response.json()
@@ -67,7 +164,7 @@ class TomTomDataFetcher:
                 "fields": "{incidents{type,geometry{type,coordinates},properties{iconCategory,magnitudeOfDelay,events{description,code},startTime,endTime,from,to,length,delay,roadNumbers,timeValidity}}}"
             }
             
-            response = requests.get(url, params=params)
+            response = self._client.get(url, params=params)
             response.raise_for_status()
             
             return response.json()
@@ -89,21 +186,36 @@ class TomTomDataFetcher:
         try:
             # Note: TomTom doesn't have a weather API, so we'd typically use a different service
             # For this example, we'll return mock weather data
-            weather_conditions = ["clear", "cloudy", "rain", "snow", "fog"]
-            road_conditions = ["dry", "wet", "icy", "snowy"]
+            current_hour = datetime.now().hour
+            key = (round(latitude, 4), round(longitude, 4), current_hour)
+            
+            # Mock weather is deterministic per location and hour, so reuse earlier results
+            if current_hour != self._weather_cache_hour:
+                self._weather_cache = {}
+                self._weather_cache_hour = current_hour
+            if key in self._weather_cache:
+                return dict(self._weather_cache[key])
             
             # Generate deterministic but varied weather based on location and time
-            seed = int(latitude * 1000 + longitude * 1000 + datetime.now().hour)
-            np.random.seed(seed)
+            rng = np.random.default_rng(hash(key) & 0xFFFFFFFF)
+            norms = rng.standard_normal(3)
+            exp_val = rng.exponential(2)
+            uniforms = rng.random(2)
             
-            return {
-                "temperature": round(np.random.normal(15, 10), 1),  # Mean 15°C, std 10°C
-                "precipitation": max(0, round(np.random.exponential(2), 1)),  # mm/h
-                "wind_speed": max(0, round(np.random.normal(10, 5), 1)),  # km/h
-                "visibility": min(10, max(0, round(np.random.normal(8, 3), 1))),  # km
-                "weather_condition": np.random.choice(weather_conditions, p=[0.4, 0.3, 0.2, 0.05, 0.05]),
-                "road_condition": np.random.choice(road_conditions, p=[0.6, 0.3, 0.05, 0.05])
+            weather_index = min(int(np.searchsorted(_WEATHER_CUM_PROBS, uniforms[0], side="right")), len(_WEATHER_CONDITIONS) - 1)
+            road_index = min(int(np.searchsorted(_ROAD_CUM_PROBS, uniforms[1], side="right")), len(_ROAD_CONDITIONS) - 1)
+            
+            weather = {
+                "temperature": round(15 + 10 * norms[0], 1),  # Mean 15°C, std 10°C
+                "precipitation": max(0, round(exp_val, 1)),  # mm/h
+                "wind_speed": max(0, round(10 + 5 * norms[1], 1)),  # km/h
+                "visibility": min(10, max(0, round(8 + 3 * norms[2], 1))),  # km
+                "weather_condition": _WEATHER_CONDITIONS[weather_index],
+                "road_condition": _ROAD_CONDITIONS[road_index]
             }
+            self._weather_cache[key] = weather
+            
+            return dict(weather)
         except Exception as e:
             logging.error(f"Error generating weather data: {str(e)}")
             return {}
@@ -118,114 +230,85 @@ class TomTomDataFetcher:
         Returns:
             DataFrame with features for ML model
         """
-        data = []
+        if not junctions:
+            return pd.DataFrame()
         
-        for junction in junctions:
+        junction_ids = [junction.get("id") for junction in junctions]
+        latitudes = [junction.get("latitude") for junction in junctions]
+        longitudes = [junction.get("longitude") for junction in junctions]
+        complexities = [junction.get("complexity", 5) for junction in junctions]  # Default complexity if not provided
+        
+        # Fetch traffic flow and incidents data for all junctions concurrently
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            flow_results = executor.map(self.get_traffic_flow, latitudes, longitudes)
+            incident_results = executor.map(self.get_incidents, latitudes, longitudes)
+            flow_data = list(flow_results)
+            incidents_data = list(incident_results)
+        
+        # Get weather data
+        weather_data = [self.get_weather(lat, lon) for lat, lon in zip(latitudes, longitudes)]
+        
+        current_hour = datetime.now().hour
+        
+        # Fill preallocated typed columns from the fetched data, dropping only malformed junctions
+        n = len(junctions)
+        valid = np.ones(n, dtype=bool)
+        has_flow = np.zeros(n, dtype=bool)
+        free_flow_speed = np.full(n, 50, dtype=np.float64)
+        current_speed = np.full(n, 50, dtype=np.float64)
+        junction_complexity = np.empty(n, dtype=np.float32)
+        incident_count = np.zeros(n, dtype=np.int32)
+        latitude = np.empty(n, dtype=np.float64)
+        longitude = np.empty(n, dtype=np.float64)
+        
+        for i, (flow, incidents) in enumerate(zip(flow_data, incidents_data)):
             try:
-                junction_id = junction.get("id")
-                latitude = junction.get("latitude")
-                longitude = junction.get("longitude")
-                complexity = junction.get("complexity", 5)  # Default complexity if not provided
-                
-                # Get traffic flow data
-                flow_data = self.get_traffic_flow(latitude, longitude)
+                if flow and "flowSegmentData" in flow:
+                    segment = flow["flowSegmentData"]
+                    # float() rejects None, which NumPy would otherwise store as NaN
+                    free_flow_speed[i] = float(segment.get("freeFlowSpeed", 50))
+                    current_speed[i] = float(segment.get("currentSpeed", free_flow_speed[i]))
+                    has_flow[i] = True
                 
-                # Get incidents data
-                incidents_data = self.get_incidents(latitude, longitude)
+                # Kept as given (fractional or out-of-scale values included); None is rejected
+                junction_complexity[i] = float(complexities[i])
                 
-                # Get weather data
-                weather_data = self.get_weather(latitude, longitude)
+                if incidents and "incidents" in incidents:
+                    incident_count[i] = len(incidents["incidents"])
                 
-                # Extract relevant features
-                current_hour = datetime.now().hour
-                
-                # Traffic volume (vehicles per hour) - estimated from flow data or default
-                traffic_volume = 500
-                if flow_data and "flowSegmentData" in flow_data:
-                    segment = flow_data["flowSegmentData"]
-                    free_flow_speed = segment.get("freeFlowSpeed", 50)
-                    current_speed = segment.get("currentSpeed", free_flow_speed)
-                    
-                    # Estimate volume based on speed ratio and road type
-                    speed_ratio = current_speed / free_flow_speed if free_flow_speed > 0 else 1
-                    base_volume = 1000 if free_flow_speed > 80 else 500
-                    
-                    # Adjust for time of day
-                    time_factor = 1.5 if (current_hour >= 7 and current_hour <= 9) or (current_hour >= 16 and current_hour <= 18) else 1.0
-                    if current_hour >= 22 or current_hour <= 5:
-                        time_factor = 0.3
-                        
-                    traffic_volume = int(base_volume * time_factor * speed_ratio)
-                
-                # Speed variance (km/h) - estimated from flow data or default
-                speed_variance = 5
-                if flow_data and "flowSegmentData" in flow_data:
-                    segment = flow_data["flowSegmentData"]
-                    free_flow_speed = segment.get("freeFlowSpeed", 50)
-                    current_speed = segment.get("currentSpeed", free_flow_speed)
-                    
-                    # Calculate variance based on difference from free flow
-                    speed_diff = abs(free_flow_speed - current_speed)
-                    speed_variance = max(5, min(30, speed_diff * 2))
-                
-                # Weather condition (encoded) - from weather data
-                weather_condition_map = {
-                    "clear": 0,
-                    "cloudy": 1,
-                    "rain": 2,
-                    "snow": 3,
-                    "fog": 4
-                }
-                weather_condition = weather_condition_map.get(weather_data.get("weather_condition", "clear"), 0)
-                
-                # Time of day (encoded: morning peak=0, day=1, evening peak=2, night=3)
-                if 7 <= current_hour <= 9:
-                    time_of_day = 0  # Morning peak
-                elif 16 <= current_hour <= 18:
-                    time_of_day = 2  # Evening peak
-                elif 22 <= current_hour or current_hour <= 5:
-                    time_of_day = 3  # Night
-                else:
-                    time_of_day = 1  # Day
-                
-                # Road condition (encoded) - from weather data
-                road_condition_map = {
-                    "dry": 0,
-                    "wet": 1,
-                    "icy": 2,
-                    "snowy": 3
-                }
-                road_condition = road_condition_map.get(weather_data.get("road_condition", "dry"), 0)
-                
-                # Junction complexity (1-10) - from junction data or default
-                junction_complexity = complexity
-                
-                # Count incidents
-                incident_count = 0
-                if incidents_data and "incidents" in incidents_data:
-                    incident_count = len(incidents_data["incidents"])
-                
-                # Create row
-                row = {
-                    "junction_id": junction_id,
-                    "traffic_volume": traffic_volume,
-                    "speed_variance": speed_variance,
-                    "weather_condition": weather_condition,
-                    "time_of_day": time_of_day,
-                    "road_condition": road_condition,
-                    "junction_complexity": junction_complexity,
-                    "incident_count": incident_count,
-                    "latitude": latitude,
-                    "longitude": longitude
-                }
-                
-                data.append(row)
+                latitude[i] = latitudes[i]
+                longitude[i] = longitudes[i]
                 
             except Exception as e:
-                logging.error(f"Error processing junction {junction.get('id')}: {str(e)}")
+                valid[i] = False
+                logging.error(f"Error processing junction {junction_ids[i]}: {str(e)}")
         
-        # Create DataFrame
-        if data:
-            return pd.DataFrame(data)
-        else:
+        if not valid.any():
             return pd.DataFrame()
+        
+        # Weather and road condition (encoded) - from weather data
+        weather_condition = _encode_conditions(
+            [weather.get("weather_condition", "clear") for weather in weather_data],
+            _WEATHER_CONDITIONS
+        )
+        road_condition = _encode_conditions(
+            [weather.get("road_condition", "dry") for weather in weather_data],
+            _ROAD_CONDITIONS
+        )
+        
+        traffic_volume, speed_variance = _derive_flow_features(
+            free_flow_speed, current_speed, has_flow, current_hour
+        )
+        
+        return pd.DataFrame({
+            "junction_id": [junction_id for junction_id, ok in zip(junction_ids, valid) if ok],
+            "traffic_volume": traffic_volume[valid],
+            "speed_variance": speed_variance[valid],
+            "weather_condition": weather_condition[valid],
+            "time_of_day": np.full(int(valid.sum()), _TIME_OF_DAY_BY_HOUR[current_hour], dtype=np.uint8),
+            "road_condition": road_condition[valid],
+            "junction_complexity": junction_complexity[valid],
+            "incident_count": incident_count[valid],
+            "latitude": latitude[valid],
+            "longitude": longitude[valid]
+        }, copy=False)
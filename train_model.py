@@ -1,5 +1,8 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import argparse
 import logging
 import os
@@ -13,12 +16,69 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# Column types for the training data CSV. Numeric columns are read as float64 so
+# float-formatted or missing values load; preprocess_data validates and downcasts them.
+COLUMN_TYPES = {
+    'junction_id': pa.string(),
+    'traffic_volume': pa.float64(),
+    'speed_variance': pa.float64(),
+    'weather_condition': pa.float64(),
+    'time_of_day': pa.float64(),
+    'road_condition': pa.float64(),
+    'junction_complexity': pa.float64(),
+    'incident_count': pa.float64(),
+    'latitude': pa.float64(),
+    'longitude': pa.float64(),
+    'risk_level': pa.float64()
+}
+
+# Compression suffixes the Arrow CSV reader detects and decompresses
+CSV_COMPRESSION_SUFFIXES = ('.gz', '.bz2', '.zst', '.lz4')
+
+# Compact dtypes for the model features
+FEATURE_DTYPES = {
+    'traffic_volume': np.int32,
+    'speed_variance': np.int16,
+    'weather_condition': np.uint8,
+    'time_of_day': np.uint8,
+    'road_condition': np.uint8,
+    'junction_complexity': np.uint8
+}
+
+# Valid value ranges for the model features; encoded categories must be known codes
+FEATURE_RANGES = {
+    'traffic_volume': (0, np.iinfo(np.int32).max),
+    'speed_variance': (0, np.iinfo(np.int16).max),
+    'weather_condition': (0, 4),
+    'time_of_day': (0, 3),
+    'road_condition': (0, 3),
+    'junction_complexity': (0, np.iinfo(np.uint8).max)
+}
+
 def load_data(data_path):
     """
-    Load training data from CSV file
+    Load training data from a Parquet or (optionally compressed) CSV file
     """
     try:
-        df = pd.read_csv(data_path)
+        # Read with the multi-threaded Arrow readers and hand the columns to pandas without copying
+        stem, suffix = os.path.splitext(data_path.lower())
+        compressed = suffix in CSV_COMPRESSION_SUFFIXES
+        if compressed:
+            # Compressed CSV (e.g. train.csv.gz), decompressed by the Arrow reader
+            suffix = os.path.splitext(stem)[1]
+        
+        if suffix == '.csv':
+            table = pacsv.read_csv(
+                data_path,
+                read_options=pacsv.ReadOptions(use_threads=True),
+                convert_options=pacsv.ConvertOptions(column_types=COLUMN_TYPES)
+            )
+        elif suffix == '.parquet' and not compressed:
+            table = pq.read_table(data_path, use_threads=True)
+        else:
+            raise ValueError(f"Unsupported data file '{data_path}', expected '.parquet' or '.csv' (optionally compressed)")
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        del table
         logging.info(f"Loaded {len(df)} records from {data_path}")
         return df
     except Exception as e:
@@ -43,9 +103,9 @@ def preprocess_data(df):
     for col in required_columns[:-1]:  # All except target
         if df[col].isnull().sum() > 0:
             if df[col].dtype == 'object':
-                df[col].fillna('unknown', inplace=True)
+                df[col] = df[col].fillna('unknown')
             else:
-                df[col].fillna(df[col].median(), inplace=True)
+                df[col] = df[col].fillna(df[col].median())
     
     # Drop rows with missing target
     if df['risk_level'].isnull().sum() > 0:
@@ -55,11 +115,21 @@ def preprocess_data(df):
     X = df[required_columns[:-1]]
     y = df['risk_level'].astype(int)
     
+    # Round median-filled values and reject values the compact dtypes would wrap
+    X = X.round()
+    for col, (low, high) in FEATURE_RANGES.items():
+        out_of_range = (X[col] < low) | (X[col] > high)
+        if out_of_range.any():
+            raise ValueError(f"Column '{col}' has {out_of_range.sum()} values outside [{low}, {high}]")
+    
+    # Downcast features to the smallest types that hold their encoded ranges
+    X = X.astype(FEATURE_DTYPES)
+    
     return X, y
 
 def main():
     parser = argparse.ArgumentParser(description='Train road safety prediction model')
-    parser.add_argument('--data', type=str, required=True, help='Path to training data CSV')
+    parser.add_argument('--data', type=str, required=True, help='Path to training data (Parquet or CSV)')
     parser.add_argument('--output', type=str, default='model/safety_model.pkl', help='Path to save model')
     parser.add_argument('--test-size', type=float, default=0.2, help='Test set size for validation')
     
@@ -84,8 +154,7 @@ def main():
         
         logging.info(f"Model trained successfully. Training accuracy: {metrics['accuracy']:.4f}")
         
-        # Evaluate on test set
-        predictor.load_model()
+        # Evaluate on test set (the trained model is already in memory)
         predictions, _ = predictor.predict(X_test)
         test_accuracy = accuracy_score(y_test, predictions)
         